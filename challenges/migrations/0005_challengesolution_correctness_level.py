@@ -1,6 +1,6 @@
 # Generated by Django 5.2 on 2025-04-24 22:05
 
-from django.db import migrations, models
+from django.db import migrations
 
 
 class Migration(migrations.Migration):
@@ -9,10 +9,7 @@ class Migration(migrations.Migration):
         ('challenges', '0004_merge_0003_merge_20250424_1840_fix_correctness_level'),
     ]
 
+    # correctness_level is now added by the AddField in fix_correctness_level,
+    # so this migration no longer has anything to do
     operations = [
-        migrations.AddField(
-            model_name='challengesolution',
-            name='correctness_level',
-            field=models.CharField(choices=[('correct', 'Correct'), ('partial', 'Partially Correct'), ('incorrect', 'Incorrect')], default='correct', max_length=20),
-        ),
     ]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations
+
+# challenge_list searches with icontains, which PostgreSQL runs as
+# UPPER(col::text) LIKE UPPER('%q%'). Trigram GIN indexes on that same
+# expression let the planner use an index instead of scanning every row.
+TRIGRAM_INDEXES = [
+    ('challenges_challenge_title_trgm', 'challenges.Challenge', 'title'),
+    ('challenges_challenge_description_trgm', 'challenges.Challenge', 'description'),
+    ('auth_user_username_trgm', settings.AUTH_USER_MODEL, 'username'),
+]
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm only exists on PostgreSQL; other backends keep the plain scan
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for index_name, model_label, field_name in TRIGRAM_INDEXES:
+        # Resolve names from the models so a custom user model is covered
+        opts = apps.get_model(model_label)._meta
+        table = schema_editor.quote_name(opts.db_table)
+        column = schema_editor.quote_name(opts.get_field(field_name).column)
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops);"
+        )
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name};")
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0005_challengesolution_correctness_level'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-15 21:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0006_challenge_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['is_approved', '-created_at'], name='ch_approved_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-15 21:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0007_challenge_ch_approved_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challengesolution',
+            index=models.Index(fields=['challenge', 'user', '-submitted_at'], name='sol_chal_user_submitted_idx'),
+        ),
+    ]
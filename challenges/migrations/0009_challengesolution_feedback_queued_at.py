@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0008_challengesolution_sol_chal_user_submitted_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challengesolution',
+            name='feedback_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
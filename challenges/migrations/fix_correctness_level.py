@@ -1,25 +1,15 @@
-from django.db import migrations, connection, models
+from django.db import migrations, models
 
 def set_default_correctness_level(apps, schema_editor):
     ChallengeSolution = apps.get_model('challenges', 'ChallengeSolution')
-    for solution in ChallengeSolution.objects.all():
-        if solution.is_correct and (not hasattr(solution, 'correctness_level') or not solution.correctness_level):
-            solution.correctness_level = 'correct'
-        elif not hasattr(solution, 'correctness_level') or not solution.correctness_level:
-            solution.correctness_level = 'incorrect'
-        solution.save()
-
-def add_correctness_level_column(apps, schema_editor):
-    # Check if the column exists
-    with connection.cursor() as cursor:
-        cursor.execute("PRAGMA table_info(challenges_challengesolution);")
-        columns = [row[1] for row in cursor.fetchall()]
-        if 'correctness_level' not in columns:
-            # Add the column if it doesn't exist
-            cursor.execute(
-                "ALTER TABLE challenges_challengesolution "
-                "ADD COLUMN correctness_level TEXT DEFAULT 'correct';"
-            )
+    # Backfill in a single UPDATE ... CASE instead of loading and saving
+    # every solution
+    ChallengeSolution.objects.filter(correctness_level__isnull=True).update(
+        correctness_level=models.Case(
+            models.When(is_correct=True, then=models.Value('correct')),
+            default=models.Value('incorrect'),
+        )
+    )
 
 class Migration(migrations.Migration):
 
@@ -27,7 +17,18 @@ class Migration(migrations.Migration):
         ('challenges', '0001_initial'),  # Adjust this to the latest migration number
     ]
 
+    # Add the column as nullable so existing rows start empty, backfill them
+    # from is_correct, then apply the model's non-null default
     operations = [
-        migrations.RunPython(add_correctness_level_column),
-        migrations.RunPython(set_default_correctness_level),
-    ]
\ No newline at end of file
+        migrations.AddField(
+            model_name='challengesolution',
+            name='correctness_level',
+            field=models.CharField(choices=[('correct', 'Correct'), ('partial', 'Partially Correct'), ('incorrect', 'Incorrect')], max_length=20, null=True),
+        ),
+        migrations.RunPython(set_default_correctness_level, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='challengesolution',
+            name='correctness_level',
+            field=models.CharField(choices=[('correct', 'Correct'), ('partial', 'Partially Correct'), ('incorrect', 'Incorrect')], default='correct', max_length=20),
+        ),
+    ]
@@ -17,6 +17,12 @@ class Challenge(models.Model):
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            # Backs the challenge list: approved challenges, newest first
+            models.Index(fields=['is_approved', '-created_at'], name='ch_approved_created_idx'),
+        ]
+    
     def __str__(self):
         return self.title
         
@@ -43,6 +49,14 @@ class ChallengeSolution(models.Model):
     is_correct = models.BooleanField(default=False)
     correctness_level = models.CharField(max_length=20, choices=CORRECTNESS_CHOICES, default='correct')
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # When AI feedback was last queued for this solution
+    feedback_queued_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            # Backs the latest-solution lookup on the challenge detail page
+            models.Index(fields=['challenge', 'user', '-submitted_at'], name='sol_chal_user_submitted_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username}'s solution to {self.challenge.title}"
@@ -0,0 +1,99 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import ChallengeSolution
+from services.ai_challenge import get_challenge_feedback
+
+logger = logging.getLogger(__name__)
+
+# Feedback still missing after this long is assumed lost (e.g. the worker
+# running the thread was restarted) and is queued again
+FEEDBACK_RETRY_AFTER = timedelta(minutes=5)
+
+# Caps how many AI calls run at once, so a burst of submissions can't start
+# an unbounded number of threads (each holding memory and, briefly, a
+# database connection)
+FEEDBACK_WORKERS = 4
+executor = ThreadPoolExecutor(max_workers=FEEDBACK_WORKERS, thread_name_prefix='feedback')
+
+def get_fallback_feedback(username):
+    """Encouraging message stored when the AI feedback can't be produced"""
+    return f"Our AI assistant is taking a break, but your solution shows real effort, {username}! Keep exploring different approaches and don't give up."
+
+def compute_feedback(solution_id, username):
+    """Fetch AI feedback for a saved solution and store it on the row
+
+    Args:
+        solution_id (int): The primary key of the ChallengeSolution
+        username (str): The username of the user who submitted the solution
+    """
+    try:
+        # get_challenge_feedback only reads the challenge's title, description
+        # and difficulty
+        solution = ChallengeSolution.objects.select_related('challenge').only(
+            'solution_text', 'challenge__title', 'challenge__description', 'challenge__difficulty'
+        ).get(pk=solution_id)
+        # Don't hold a database connection open for the seconds the AI call
+        # takes; the update below opens a fresh one
+        connection.close()
+        try:
+            logger.debug("Getting AI feedback for challenge solution: %.100s...", solution.solution_text)
+            feedback = get_challenge_feedback(
+                solution.solution_text,
+                solution.challenge,
+                username
+            )
+            logger.debug("Received AI feedback: %.100s...", feedback)
+        except Exception as e:
+            logger.error("Error getting AI feedback: %s", e)
+            feedback = get_fallback_feedback(username)
+
+        # update() writes the one column without re-firing post_save
+        ChallengeSolution.objects.filter(pk=solution_id).update(ai_feedback=feedback)
+    except ChallengeSolution.DoesNotExist:
+        logger.warning("Solution %s was removed before feedback was ready", solution_id)
+    except Exception as e:
+        # Nothing else will retry from here, so never leave the feedback empty
+        logger.error("Error storing AI feedback for solution %s: %s", solution_id, e)
+        try:
+            ChallengeSolution.objects.filter(pk=solution_id, ai_feedback='').update(
+                ai_feedback=get_fallback_feedback(username)
+            )
+        except Exception as e:
+            logger.error("Error storing fallback feedback for solution %s: %s", solution_id, e)
+    finally:
+        # Pool threads are reused, so release this thread's connection when done
+        connection.close()
+
+def queue_feedback(solution_id, username):
+    """Run compute_feedback on the feedback pool once the current transaction commits
+
+    The AI call takes seconds, so it runs off the request thread and the
+    view can redirect straight away. The detail page polls for the result.
+    """
+    transaction.on_commit(lambda: executor.submit(compute_feedback, solution_id, username))
+
+def retry_feedback(solution_id, username):
+    """Queue feedback again for a solution whose feedback never arrived
+
+    The claim is a single conditional update, so when several page views
+    race only the one that moves feedback_queued_at forward queues the work.
+
+    Returns:
+        bool: True if this call queued the retry
+    """
+    now = timezone.now()
+    cutoff = now - FEEDBACK_RETRY_AFTER
+    claimed = ChallengeSolution.objects.filter(
+        Q(feedback_queued_at__lt=cutoff)
+        # Rows saved before feedback_queued_at existed
+        | Q(feedback_queued_at__isnull=True, submitted_at__lt=cutoff),
+        pk=solution_id,
+        ai_feedback='',
+    ).update(feedback_queued_at=now)
+    if claimed:
+        queue_feedback(solution_id, username)
+    return bool(claimed)
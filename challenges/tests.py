@@ -1,3 +1,168 @@
+import json
+from unittest import mock
+from django.utils import timezone
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.urls import reverse
+from .models import Challenge, ChallengeSolution
+from .tasks import FEEDBACK_RETRY_AFTER, compute_feedback, retry_feedback
+from .views import DEFAULT_HINTS, get_challenge_page
 
-# Create your tests here.
+class ChallengePageTests(TestCase):
+    """Tests for the challenge list page query"""
+
+    def setUp(self):
+        author = User.objects.create_user(username='ada', password='password')
+        other = User.objects.create_user(username='grace', password='password')
+        Challenge.objects.create(title='Reverse a list', description='Flip it.',
+                                 difficulty='beginner', created_by=author, is_approved=True)
+        Challenge.objects.create(title='FizzBuzz', description='Count to 100.',
+                                 difficulty='beginner', created_by=other, is_approved=True)
+
+    def titles(self, query):
+        return [challenge.title for challenge in get_challenge_page('', query, 1)['challenges']]
+
+    def test_search_matches_title_description_and_author(self):
+        self.assertEqual(self.titles('reverse'), ['Reverse a list'])
+        self.assertEqual(self.titles('count to'), ['FizzBuzz'])
+        self.assertEqual(self.titles('ADA'), ['Reverse a list'])
+        self.assertEqual(self.titles('nothing like this'), [])
+
+    def test_search_does_not_join_users(self):
+        with CaptureQueriesContext(connection) as queries:
+            get_challenge_page('', 'ada', 1)
+        # Only the card fetch joins auth_user, for the author's name
+        joins = [query['sql'] for query in queries.captured_queries if 'JOIN "auth_user"' in query['sql']]
+        self.assertEqual(len(joins), 1)
+        self.assertIn('"challenges_challenge"."title"', joins[0])
+
+    def test_search_matching_many_authors_still_finds_them(self):
+        with mock.patch('challenges.views.SEARCH_AUTHOR_LIMIT', 1):
+            self.assertEqual(self.titles('a'), ['FizzBuzz', 'Reverse a list'])
+
+class ComputeFeedbackTests(TestCase):
+    """Tests for the background AI feedback task"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='coder', password='password')
+        self.challenge = Challenge.objects.create(
+            title='Sum It Up',
+            description='Add two numbers.',
+            difficulty='beginner',
+            created_by=self.user,
+            is_approved=True
+        )
+        self.solution = ChallengeSolution.objects.create(
+            challenge=self.challenge,
+            user=self.user,
+            solution_text='first',
+            is_correct=True
+        )
+
+    def run_task(self, get_feedback):
+        # The task closes its thread's connection; keep the test's open
+        with mock.patch('challenges.tasks.get_challenge_feedback', get_feedback), \
+                mock.patch('challenges.tasks.connection'):
+            compute_feedback(self.solution.pk, self.user.username)
+        self.solution.refresh_from_db()
+
+    def test_stores_feedback(self):
+        self.run_task(mock.Mock(return_value='feedback for first'))
+        self.assertEqual(self.solution.ai_feedback, 'feedback for first')
+
+    def test_stores_fallback_when_saving_feedback_fails(self):
+        with mock.patch('challenges.tasks.ChallengeSolution.objects.select_related',
+                        side_effect=RuntimeError('database went away')):
+            self.run_task(mock.Mock(return_value='feedback for first'))
+        self.assertIn('taking a break', self.solution.ai_feedback)
+
+    def test_stale_feedback_retry_is_queued_once(self):
+        ChallengeSolution.objects.filter(pk=self.solution.pk).update(
+            feedback_queued_at=timezone.now() - FEEDBACK_RETRY_AFTER * 2
+        )
+        with mock.patch('challenges.tasks.queue_feedback') as queue_feedback:
+            claimed = [retry_feedback(self.solution.pk, self.user.username) for _ in range(2)]
+        self.assertEqual(claimed, [True, False])
+        queue_feedback.assert_called_once()
+
+class SubmitSolutionTests(TestCase):
+    """Tests for the submit_solution view"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='coder', password='password')
+        self.challenge = Challenge.objects.create(
+            title='Sum It Up',
+            description='Add two numbers.',
+            difficulty='beginner',
+            created_by=self.user,
+            is_approved=True
+        )
+        self.client.login(username='coder', password='password')
+
+    def submit(self, text):
+        with mock.patch('challenges.views.queue_feedback'), \
+                CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse('submit_solution', args=[self.challenge.pk]),
+                {'solution_text': text}
+            )
+        return queries
+
+    def test_resubmit_does_not_load_full_challenge(self):
+        # The view loads only the challenge columns it needs; the progress
+        # signal must reuse that instance rather than fetching description
+        for text in ('first', 'second'):
+            queries = self.submit(text)
+            self.assertFalse(any(
+                '"challenges_challenge"."description"' in query['sql']
+                for query in queries.captured_queries
+            ))
+        self.assertEqual(
+            ChallengeSolution.objects.filter(challenge=self.challenge, user=self.user).count(),
+            2
+        )
+
+    def test_double_submit_saves_once(self):
+        with mock.patch('challenges.views.queue_feedback') as queue_feedback:
+            for _ in range(2):
+                self.client.post(
+                    reverse('submit_solution', args=[self.challenge.pk]),
+                    {'solution_text': 'same answer'}
+                )
+        self.assertEqual(
+            ChallengeSolution.objects.filter(challenge=self.challenge, user=self.user).count(),
+            1
+        )
+        queue_feedback.assert_called_once()
+
+class GenerateAIChallengeTests(TestCase):
+    """Tests for parsing the AI-generated challenge"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='coder', password='password')
+        self.client.login(username='coder', password='password')
+
+    def generate(self, data):
+        result = {"raw": json.dumps(data)}
+        with mock.patch('challenges.views.generate_new_challenge', return_value=result):
+            self.client.post(reverse('generate_challenge'), {'difficulty': 'beginner', 'topic': 'lists'})
+        return Challenge.objects.get(created_by=self.user)
+
+    def test_uses_ai_hints_and_fills_missing_ones(self):
+        challenge = self.generate({
+            "title": "Reverse a list",
+            "description": "Flip it.",
+            "hints": ["Use slicing.", "  "],
+        })
+        self.assertEqual(challenge.title, "Reverse a list")
+        self.assertEqual(challenge.hints, ["Use slicing.", DEFAULT_HINTS[1], DEFAULT_HINTS[2]])
+
+    def test_falls_back_when_hints_are_not_a_list_of_strings(self):
+        challenge = self.generate({"title": "T", "description": "D", "hints": "Use slicing."})
+        self.assertEqual(challenge.hints, list(DEFAULT_HINTS))
+        Challenge.objects.all().delete()
+
+        challenge = self.generate({"title": "T", "description": "D", "hints": [{"text": "x"}, 3, "Loop."]})
+        self.assertEqual(challenge.hints, [DEFAULT_HINTS[0], DEFAULT_HINTS[1], "Loop."])
@@ -1,19 +1,39 @@
+import json
+import logging
+from datetime import timedelta
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db import models
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+from django.db.models import Count, Window
+from django.db.models.functions import Substr
+from django.utils import timezone
 from .models import Challenge, ChallengeSolution, QuoteSubmission
 from .forms import ChallengeForm, ChallengeSolutionForm
-from services.ai_challenge import get_challenge_feedback, generate_new_challenge
+from .tasks import FEEDBACK_RETRY_AFTER, queue_feedback, retry_feedback
+from services.ai_challenge import generate_new_challenge
 
-@login_required
-def challenge_list(request):
-    """View for listing all challenges with pagination and search"""
-    # Get filter parameters
-    difficulty = request.GET.get('difficulty', '')
-    query = request.GET.get('q', '')
-    page = int(request.GET.get('page', 1))
-    
+logger = logging.getLogger(__name__)
+
+# Fallbacks for any hint the AI leaves out
+DEFAULT_HINTS = (
+    "Start by breaking down the problem into smaller parts. What's the first step you would take?",
+    "Consider edge cases and how your solution handles different inputs. What assumptions are you making?",
+    "Look at your algorithm's efficiency. Can you optimize it further? Remember to test your solution with various inputs.",
+)
+
+# A repeat of the same solution within this window (e.g. a double-clicked
+# submit) is treated as the same submission
+DUPLICATE_SUBMISSION_WINDOW = timedelta(seconds=30)
+
+# Most author ids a search will inline into the challenge query; broader
+# matches search through the user join instead
+SEARCH_AUTHOR_LIMIT = 100
+
+def get_challenge_page(difficulty, query, page, items_per_page=6):
+    """Return one page of approved challenges plus the pagination totals"""
     # Get challenges from database
     challenges = Challenge.objects.filter(is_approved=True)
     
@@ -21,56 +41,120 @@ def challenge_list(request):
     if difficulty:
         challenges = challenges.filter(difficulty=difficulty)
     
-    # Apply search query if provided
+    # Apply search query if provided (backed by trigram indexes on PostgreSQL).
+    # Matching authors are looked up first so every arm of the OR is on the
+    # challenge table; an arm on the joined user table would stop PostgreSQL
+    # from combining the indexes and force a full scan. A query matching
+    # more authors than SEARCH_AUTHOR_LIMIT (e.g. a single letter) would
+    # bloat the IN list, so it uses the join instead.
     if query:
+        author_ids = list(
+            User.objects.filter(username__icontains=query)
+            .values_list('pk', flat=True)[:SEARCH_AUTHOR_LIMIT + 1]
+        )
+        if len(author_ids) > SEARCH_AUTHOR_LIMIT:
+            author_match = models.Q(created_by__username__icontains=query)
+        else:
+            author_match = models.Q(created_by_id__in=author_ids)
         challenges = challenges.filter(
             models.Q(title__icontains=query) | 
             models.Q(description__icontains=query) |
-            models.Q(created_by__username__icontains=query)
+            author_match
         )
     
     # Order challenges by creation date (newest first)
     challenges = challenges.order_by('-created_at')
     
     # Pagination
-    items_per_page = 6
-    total_challenges = challenges.count()
-    total_pages = (total_challenges + items_per_page - 1) // items_per_page
-    
-    # Handle page boundaries
     if page < 1:
         page = 1
-    elif page > total_pages and total_pages > 0:
-        page = total_pages
     
-    # Get current page items
+    # Get current page items. The OFFSET is applied to a pk-only query so the
+    # database skips over index entries rather than full rows, then the page
+    # is fetched by pk. Where the database supports it, COUNT(*) OVER ()
+    # returns the total alongside the page's pks, saving a separate COUNT.
+    total_challenges = None
+    page_ids = []
     start_index = (page - 1) * items_per_page
     end_index = start_index + items_per_page
-    current_challenges = challenges[start_index:end_index]
-    
-    # Check if user has already submitted solutions for these challenges
-    if request.user.is_authenticated:
-        challenge_ids = [challenge.id for challenge in current_challenges]
-        user_solutions = {}
-        solutions = ChallengeSolution.objects.filter(
-            challenge_id__in=challenge_ids,
-            user=request.user
+    if connection.features.supports_over_clause:
+        rows = list(
+            challenges.annotate(total=Window(expression=Count('*')))
+            .values_list('pk', 'total')[start_index:end_index]
         )
-        for solution in solutions:
-            user_solutions[solution.challenge_id] = solution
-    else:
-        user_solutions = {}
+        if rows:
+            total_challenges = rows[0][1]
+            page_ids = [pk for pk, _ in rows]
     
-    context = {
+    if total_challenges is None:
+        # No window functions, or the page is past the end: count separately
+        # and clamp to the last page
+        total_challenges = challenges.count()
+        last_page = (total_challenges + items_per_page - 1) // items_per_page
+        if page > last_page and last_page > 0:
+            page = last_page
+        start_index = (page - 1) * items_per_page
+        end_index = start_index + items_per_page
+        page_ids = list(challenges.values_list('pk', flat=True)[start_index:end_index])
+    
+    total_pages = (total_challenges + items_per_page - 1) // items_per_page
+    
+    # Join the author so the template doesn't fetch created_by once per card.
+    # Only the columns the cards show are loaded; the description comes back
+    # as a short preview.
+    current_challenges = list(
+        Challenge.objects.filter(pk__in=page_ids)
+        .select_related('created_by')
+        .only('id', 'title', 'difficulty', 'is_ai_generated', 'created_at', 'created_by__username')
+        .annotate(desc_preview=Substr('description', 1, 200))
+        .order_by('-created_at')
+    )
+    
+    return {
         'challenges': current_challenges,
+        'page_ids': page_ids,
+        'total_challenges': total_challenges,
+        'total_pages': total_pages,
+        'page': page,
+    }
+
+@login_required
+def challenge_list(request):
+    """View for listing all challenges with pagination and search"""
+    # Get filter parameters
+    difficulty = request.GET.get('difficulty', '')
+    query = request.GET.get('q', '')
+    page = int(request.GET.get('page', 1))
+    
+    # Get the page of challenges and the pagination totals
+    challenge_page = get_challenge_page(difficulty, query, page)
+    page_ids = challenge_page['page_ids']
+    total_pages = challenge_page['total_pages']
+    page = challenge_page['page']
+    
+    # Check if user has already submitted solutions for these challenges.
+    # The template only tests membership, so map challenge id -> solution id
+    # without building model instances.
+    user_solutions = dict(
+        ChallengeSolution.objects.filter(
+            challenge_id__in=page_ids,
+            user=request.user
+        ).values_list('challenge_id', 'id')
+    )
+    
+    # Page links shown either side of the current page
+    page_range = list(range(max(1, page - 2), min(total_pages + 1, page + 3)))
+    
+    context = {
+        'challenges': challenge_page['challenges'],
         'difficulty_filter': difficulty,
         'query': query,
-        'total_challenges': total_challenges,
+        'total_challenges': challenge_page['total_challenges'],
         'total_pages': total_pages,
         'current_page': page,
         'has_prev': page > 1,
         'has_next': page < total_pages,
-        'page_range': range(max(1, page - 2), min(total_pages + 1, page + 3)),
+        'page_range': page_range,
         'user_solutions': user_solutions,
     }
     
@@ -79,15 +163,29 @@ def challenge_list(request):
 @login_required
 def challenge_detail(request, pk):
     """View for displaying a single challenge"""
-    challenge = get_object_or_404(Challenge, pk=pk, is_approved=True)
+    # The page shows the author's name, so join it rather than querying again
+    challenge = get_object_or_404(Challenge.objects.select_related('created_by'), pk=pk, is_approved=True)
     
-    # Check if user has already submitted a solution
-    user_solution = None
-    if request.user.is_authenticated:
-        user_solution = ChallengeSolution.objects.filter(
-            challenge=challenge,
-            user=request.user
-        ).order_by('-submitted_at').first()
+    # Check if user has already submitted a solution, loading only the
+    # fields the solution panel shows
+    user_solution = ChallengeSolution.objects.filter(
+        challenge=challenge,
+        user=request.user
+    ).only(
+        'id', 'solution_text', 'ai_feedback', 'is_correct', 'submitted_at', 'feedback_queued_at'
+    ).order_by('-submitted_at').first()
+    
+    # Feedback that never arrived (e.g. the worker restarted mid-call) is
+    # queued again rather than leaving the page waiting forever. The check
+    # here only skips the claim query on the common path; retry_feedback
+    # makes sure concurrent views queue it once.
+    if (
+        user_solution
+        and not user_solution.ai_feedback
+        and (user_solution.feedback_queued_at or user_solution.submitted_at)
+            < timezone.now() - FEEDBACK_RETRY_AFTER
+    ):
+        retry_feedback(user_solution.pk, request.user.username)
     
     # Create solution form
     form = ChallengeSolutionForm()
@@ -126,8 +224,10 @@ def quote_list(request):
 
 @login_required
 def submit_solution(request, pk):
-    """Submit a solution to a challenge and get AI feedback"""
-    challenge = get_object_or_404(Challenge, pk=pk, is_approved=True)
+    """Submit a solution to a challenge and queue AI feedback"""
+    # The solution only needs the challenge's key, plus its difficulty for the
+    # progress signal; the feedback task loads the text it needs itself
+    challenge = get_object_or_404(Challenge.objects.only('id', 'difficulty'), pk=pk, is_approved=True)
     
     if request.method == 'POST':
         form = ChallengeSolutionForm(request.POST)
@@ -138,36 +238,50 @@ def submit_solution(request, pk):
                 solution.challenge = challenge
                 solution.user = request.user
                 solution.is_correct = True  # Mark all submitted solutions as correct for now
-                # Check if correctness_level column exists and set it
-                try:
-                    solution.correctness_level = 'correct'  # Set correctness level to 'correct' by default
-                except Exception as e:
-                    print(f"Error setting correctness_level: {e}")
-                    # Field might not exist yet, continue anyway
+                solution.correctness_level = 'correct'
+                solution.feedback_queued_at = timezone.now()
                 
-                # Get AI feedback
-                try:
-                    print(f"Getting AI feedback for challenge solution: {solution.solution_text[:100]}...")
-                    solution.ai_feedback = get_challenge_feedback(
-                        solution.solution_text, 
-                        challenge, 
-                        request.user.username
-                    )
-                    print(f"Received AI feedback: {solution.ai_feedback[:100]}...")
-                except Exception as e:
-                    print(f"Error getting AI feedback: {e}")
-                    solution.ai_feedback = f"Our AI assistant is taking a break, but your solution shows real effort, {request.user.username}! Keep exploring different approaches and don't give up."
+                # Save the solution and its progress updates together, then
+                # fetch the AI feedback in the background once it's committed
+                with transaction.atomic():
+                    # Lock the user's row so concurrent posts from the same
+                    # user are checked for duplicates one at a time
+                    User.objects.select_for_update().only('id').get(pk=request.user.pk)
+                    duplicate = ChallengeSolution.objects.filter(
+                        challenge=challenge,
+                        user=request.user,
+                        solution_text=solution.solution_text,
+                        submitted_at__gte=timezone.now() - DUPLICATE_SUBMISSION_WINDOW
+                    ).exists()
+                    if not duplicate:
+                        solution.save()
+                        queue_feedback(solution.pk, request.user.username)
                 
-                solution.save()
-                messages.success(request, "Your solution has been submitted! Check out the AI feedback.")
+                if duplicate:
+                    messages.info(request, "You've just submitted this solution - your AI feedback is on its way.")
+                else:
+                    messages.success(request, "Your solution has been submitted! Your AI feedback will appear shortly.")
             except Exception as e:
-                print(f"Error saving solution: {e}")
+                logger.error("Error saving solution: %s", e)
                 messages.error(request, "There was an error saving your solution. Please try again.")
         else:
             messages.error(request, "Please correct the errors in the form.")
     
     return redirect('challenge_detail', pk=pk)
 
+@login_required
+def solution_feedback(request, pk):
+    """Return the AI feedback for one of the user's solutions once it's ready"""
+    solution = get_object_or_404(
+        ChallengeSolution.objects.only('id', 'ai_feedback'),
+        pk=pk,
+        user=request.user
+    )
+    return JsonResponse({
+        'ready': bool(solution.ai_feedback),
+        'feedback': solution.ai_feedback,
+    })
+
 @login_required
 def generate_ai_challenge(request):
     """Generate a challenge using AI"""
@@ -176,46 +290,27 @@ def generate_ai_challenge(request):
         topic = request.POST.get('topic', 'programming')
         
         try:
-            # # Get AI-generated challenge
-            # challenge_text = generate_new_challenge(difficulty, topic, request.user.username)
-            
-            # # Parse the response with improved structured parsing
-            # lines = challenge_text.strip().split('\n')
+            # The AI responds with a JSON object: title, description and hints
             result = generate_new_challenge(difficulty, topic, request.user.username)
-            challenge_text = result["raw"]
-            ai_hints = [result["hints"].get(f"hint_{i}") for i in range(1, 4)]
-            # Extract title and description from the raw text
-            title = ""
-            description = ""
-            lines = challenge_text.strip().split('\n')
-            current_section = None
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                if line.startswith("TITLE:"):
-                    title = line.replace("TITLE:", "").strip()
-                    current_section = "title"
-                elif line.startswith("DESCRIPTION:"):
-                    current_section = "description"
-                elif current_section == "description" and not line.startswith("HINT"):
-                    description += line + "\n"
-            # Ensure we have exactly 3 hints with quality fallbacks
-            default_hints = [
-                "Start by breaking down the problem into smaller parts. What's the first step you would take?",
-                "Consider edge cases and how your solution handles different inputs. What assumptions are you making?",
-                "Look at your algorithm's efficiency. Can you optimize it further? Remember to test your solution with various inputs."
+            data = json.loads(result["raw"])
+            title = (data.get("title") or "").strip()
+            description = (data.get("description") or "").strip()
+            # Only a list of hints is usable; pad it so a short list still
+            # lines up with the defaults
+            ai_hints = data.get("hints")
+            if not isinstance(ai_hints, list):
+                ai_hints = []
+            ai_hints = ai_hints + [None] * len(DEFAULT_HINTS)
+            # Ensure we have exactly 3 hints with quality fallbacks, skipping
+            # anything that isn't a non-empty string
+            hints = [
+                hint.strip() if isinstance(hint, str) and hint.strip() else default
+                for hint, default in zip(ai_hints, DEFAULT_HINTS)
             ]
-            hints = []
-            for i in range(3):
-                if ai_hints[i] and ai_hints[i].strip():
-                    hints.append(ai_hints[i].strip())
-                else:
-                    hints.append(default_hints[i])
             # Create the challenge
             challenge = Challenge(
                 title=title if title else "AI Generated Challenge",
-                description=description.strip(),
+                description=description,
                 difficulty=difficulty,
                 hints=hints,
                 created_by=request.user,
@@ -227,7 +322,7 @@ def generate_ai_challenge(request):
             messages.success(request, "Your AI challenge has been generated!")
             return redirect('challenge_detail', pk=challenge.pk)
         except Exception as e:
-            print(f"Error generating AI challenge: {e}")
+            logger.error("Error generating AI challenge: %s", e)
             messages.error(request, "There was an error generating your challenge. Please try again.")
     
     return render(request, 'challenges/generate_challenge.html')
\ No newline at end of file
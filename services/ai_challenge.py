@@ -1,7 +1,6 @@
 
 import os
 import google.generativeai as genai
-import re
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -95,24 +94,23 @@ def generate_new_challenge(difficulty, topic="programming", username="Developer"
     3. Include clear, achievable goals with a definite solution
     4. Provide EXACTLY 3 progressive hints that help guide without giving away the answer
     
-    You MUST format your response EXACTLY as follows with these precise headers and no deviations:
+    You MUST respond with a single JSON object and nothing else, using exactly these keys:
     
-    TITLE: (concise, engaging title)
-    
-    DESCRIPTION:
-    (Clear problem statement including any examples, input/output format, and constraints)
-    
-    HINT 1: (First subtle hint that gives general direction)
-    
-    HINT 2: (Medium hint that provides more specific guidance)
-    
-    HINT 3: (More direct hint that helps them solve the problem without giving away the full solution)
+    {{
+        "title": "(concise, engaging title)",
+        "description": "(Clear problem statement including any examples, input/output format, and constraints)",
+        "hints": [
+            "(First subtle hint that gives general direction)",
+            "(Medium hint that provides more specific guidance)",
+            "(More direct hint that helps them solve the problem without giving away the full solution)"
+        ]
+    }}
     
     IMPORTANT:
-    - Each section MUST be preceded by its exact header (TITLE:, DESCRIPTION:, HINT 1:, etc.)
-    - Do not add any additional sections or headers
-    - Do not number the hints beyond the headers (don't add "1." after "HINT 1:")
-    - Include line breaks in the description for readability
+    - "hints" MUST be a list of exactly 3 strings
+    - Do not add any additional keys
+    - Do not number the hints (don't add "1." or "Hint 1:" to the hint text)
+    - Include line breaks (\\n) in the description for readability
     - Make the challenge supportive and encouraging to help build confidence
     """
     
@@ -125,14 +123,15 @@ def generate_new_challenge(difficulty, topic="programming", username="Developer"
             
             # Generate response
             print(f"Trying to generate new challenge with model: {model_name}")
-            response = model.generate_content(prompt)
+            # Ask for JSON so the caller can json.loads() the response
+            response = model.generate_content(
+                prompt,
+                generation_config={"response_mime_type": "application/json"}
+            )
             
-            # Parse and return hints along with the full response
-            response_text = response.text
-            hints = extract_hints(response_text)
+            # Return the raw JSON text
             return {
-                "raw": response_text,
-                "hints": hints
+                "raw": response.text
             }
         except Exception as e:
             print(f"Error with model {model_name}: {e}")
@@ -142,18 +141,3 @@ def generate_new_challenge(difficulty, topic="programming", username="Developer"
     # If we get here, none of the models worked
     print(f"All model attempts failed. Last error: {last_error}")
     return f"Our AI assistant is taking a break. Please try generating a challenge again later."
-
-def extract_hints(ai_response):
-    """
-    Extracts HINT 1, HINT 2, and HINT 3 from the AI response text.
-    Returns a dictionary with the hints, or None if not found.
-    """
-    hints = {}
-    for i in range(1, 4):
-        pattern = rf"HINT {i}:(.*?)(?=HINT {i+1}:|$)"
-        match = re.search(pattern, ai_response, re.DOTALL | re.IGNORECASE)
-        if match:
-            hints[f"hint_{i}"] = match.group(1).strip()
-        else:
-            hints[f"hint_{i}"] = None
-    return hints
\ No newline at end of file